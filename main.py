@@ -5,6 +5,7 @@ import json
 from pathlib import Path
 from src.data_charge import DataCharger
 from src.sentiments_analyse import SentimentAnalyzer
+from src.doublons import DetecteurDoublons
 from src.rapport_generateur import Generateur_rapport
 from src.vue_turtle import TurtleVisualizer
 from src.config import Config
@@ -54,16 +55,35 @@ def main() -> None:
         print("Analyse en cours...")
         analyzer = SentimentAnalyzer(
             positive_seuil=config.positive_seuil,
-            negative_seuil=config.negative_seuil
+            negative_seuil=config.negative_seuil,
+            lexique_artefact=config.lexique_artefact,
+            lexique_source=config.lexique_source
+        )
+        detecteur = None
+        if config.dedup_active:
+            detecteur = DetecteurDoublons(
+                preprocess=analyzer.preprocess_text,
+                nb_permutations=config.dedup_nb_permutations,
+                seuil_similarite=config.dedup_seuil_similarite,
+                max_clusters=config.dedup_max_clusters
+            )
+        analyzed_df = analyzer.analyse_dataframe(
+            reviews_df,
+            text_column=config.text_column,
+            detecteur_doublons=detecteur,
+            scores_bruts=config.conserver_scores_bruts
         )
-        analyzed_df = analyzer.analyse_dataframe(reviews_df)
         print("Analyse terminée")
         
         # Étape 3: Génération des rapports
         print("Génération des rapports...")
         report_gen = Generateur_rapport(
             output_csv=config.output_csv,
-            output_summary=config.output_summary
+            output_summary=config.output_summary,
+            output_termes=config.output_termes,
+            top_k=config.top_k_termes,
+            lexique=analyzer.lexique,
+            text_column=config.text_column
         )
         report_gen.generer_rapports(analyzed_df)
         print(f"Rapports: {config.output_csv}, {config.output_summary}")
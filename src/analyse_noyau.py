@@ -0,0 +1,299 @@
+"""
+Noyau de l'analyse de sentiment, sans dépendance à pandas.
+
+Travaille sur des textes ou des enregistrements (dict) et retourne des
+résultats compacts : adapté aux appels unitaires et aux petits lots,
+où construire un DataFrame coûterait plus cher que l'analyse elle-même.
+"""
+import logging
+import re  # pour gérer les expressions régulières et nettoyer le texte
+from typing import Iterable, Literal, Optional  # pour typer précisément les labels de sentiment
+from src.lexique import CATEGORIES, Lexique, preparer_lexique  # pour charger un lexique compilé
+
+# Permet de préciser que le label retourné sera soit "Positif", "Negatif" ou "Neutre"
+SentimentLabel = Literal["Positif", "Negatif", "Neutre"]
+
+# --- Dictionnaire des mots-clés positifs ---
+POSITIVE_WORDS = {
+    
+  
+    'excellent', 'génial', 'merveilleux', 'fantastique', 'incroyable',
+  
+    'adore', 'aime', 'superbe', 'parfait', 'magnifique', 'ravissant',
+  
+    'très bien', 'très bon', 'très facile', 'très rapide', 'très satisfait',
+  
+    'satisfait', 'content', 'heureux', 'ravi', 'comblé', 'enchanté',
+  
+    'recommande', 'meilleur', 'top', 'idéal', 'simple', 'efficace',
+  
+    'bonne affaire', 'bon prix', 'qualité', 'belle', 'élégant', 'moderne',
+  
+    'facile', 'rapide', 'fiable', 'solide', 'durable', 'pratique',
+  
+    'cinq étoiles', '⭐', 'reviendrais', 'reachèterais', 'réserver',
+  
+    'fonction parfaitement', 'fonctionne bien', 'fonctionne comme prévu', 'convient parfaitement',
+  
+    'merci', 'agréable', 'plaisir', 'divertissant', 'utile', 'efficacement'
+}
+
+
+# --- Dictionnaire des mots-clés négatifs ---
+NEGATIVE_WORDS = {
+
+    'horrible', 'nul', 'pourri', 'mauvais', 'pire', 'inutilisable',
+
+    'cassé', 'défaillant', 'décevant', 'dommage', 'décep', 'frustrant',
+
+    'problème', 'bug', 'erreur', 'panne', 'dysfonction', 'défaut',
+
+    'trop cher', 'cher', 'chère', 'onéreux', 'ruineux',
+
+    'n\'a jamais', 'n\'ai jamais', 'pas reçu', 'n\'ai reçu que',
+
+    'moitié', 'endommagé', 'abîmé', 'déchiré', 'mal traduit',
+
+    'incompréhensible', 'confus', 'confuses', 'trop lourd',
+
+    'retard', 'retardé', 'en retard', 'ne correspond pas',
+
+    'n\'aurais pas', 'préféré', 'hésité', 'hésiter', 'ne suis pas sûr',
+
+    'qualité n\'est pas', 'n\'est pas au rendez-vous', 'mediocre',
+
+    'impossible', 'difficultés', 'scandaleux', 'mauvais service' , 'plaisir' ,
+    
+    'meilleur'
+}
+
+# Permet de détecter si le texte contient des mots qui amplifient le sentiment
+
+INTENSIFIERS = {'très', 'extrêmement', 'absolument', 'tellement', 'ultra', 'super', 'vraiment'}
+
+NEGATIONS = {'n\'', 'pas', 'jamais', 'non', 'aucun', 'aucune'}
+
+# Lexique utilisé quand ni source ni artefact ne sont fournis (copie de data/lexique.json)
+LEXIQUE_INTEGRE = Lexique.depuis_ensembles(
+    "integre",
+    positifs=POSITIVE_WORDS,
+    negatifs=NEGATIVE_WORDS,
+    intensifieurs=INTENSIFIERS,
+    negations=NEGATIONS,
+)
+
+# Expressions régulières du prétraitement, compilées une seule fois
+_URL = re.compile(r'http\S+|www\S+|https\S+')
+_PONCTUATION = re.compile(r'[^\w\s⭐]')
+_ESPACES = re.compile(r'\s+')
+
+NAN = float("nan")
+
+# Position des catégories dans les résultats de Lexique.compter
+_POSITIFS = CATEGORIES.index("positifs")
+_NEGATIFS = CATEGORIES.index("negatifs")
+_INTENSIFIEURS = CATEGORIES.index("intensifieurs")
+
+
+def preprocess_text(text: str) -> str:
+    """Normalise un texte : minuscules, sans URL, ponctuation ni espaces multiples."""
+    if not text:
+        return ""
+
+    # Mettre en minuscule
+    text = text.lower()
+
+    # Supprimer les URL
+    text = _URL.sub('', text)
+
+    # Supprimer ponctuation et symboles spéciaux (sauf emojis)
+    text = _PONCTUATION.sub('', text)
+
+    # Supprimer espaces multiples
+    text = _ESPACES.sub(' ', text).strip()
+
+    return text
+
+
+class ResultatAnalyse:
+    """
+    Résultat compact de l'analyse d'un avis.
+
+    En plus du label et de la polarité arrondie, garde les scores continus
+    (avant arrondi et seuils) pour recalibrer les seuils sans réanalyser.
+    Ils valent NaN quand le texte n'a pas pu être analysé.
+    """
+
+    __slots__ = ("identifiant", "sentiment", "polarite", "polarite_textblob", "score_mots_cles", "score_brut")
+
+    def __init__(
+        self,
+        identifiant,
+        sentiment: SentimentLabel,
+        polarite: float,
+        polarite_textblob: float = NAN,
+        score_mots_cles: float = NAN,
+        score_brut: float = NAN,
+    ):
+        self.identifiant = identifiant
+        self.sentiment = sentiment
+        self.polarite = polarite
+        self.polarite_textblob = polarite_textblob
+        self.score_mots_cles = score_mots_cles
+        self.score_brut = score_brut
+
+    def __iter__(self):
+        # Permet le déballage : sentiment, polarite = resultat
+        return iter((self.sentiment, self.polarite))
+
+    def __repr__(self) -> str:
+        return f"ResultatAnalyse({self.identifiant!r}, {self.sentiment!r}, {self.polarite!r})"
+
+
+class MoteurSentiment:
+    """Analyse le sentiment de textes ou d'enregistrements, sans pandas."""
+
+    def __init__(
+        self,
+        positive_seuil: float = 0.1,
+        negative_seuil: float = -0.1,
+        lexique_artefact: Optional[str] = None,
+        lexique_source: Optional[str] = None,
+    ):
+        """
+        Initialise le moteur avec des seuils pour déterminer le sentiment.
+        positive_seuil : score minimum pour considérer un texte comme positif
+        negative_seuil : score maximum pour considérer un texte comme négatif
+        lexique_artefact : artefact compilé par src.lexique
+        lexique_source : lexique JSON, compilé vers lexique_artefact s'il manque ou est périmé
+        (lexique intégré si aucun des deux n'est fourni)
+        """
+        self.positive_seuil = positive_seuil
+        self.negative_seuil = negative_seuil
+
+        # Chargement du lexique (mmap) et de son automate de recherche
+        if lexique_source or lexique_artefact:
+            self.lexique = preparer_lexique(lexique_source or None, lexique_artefact or None)
+        else:
+            self.lexique = LEXIQUE_INTEGRE
+
+        # TextBlob est importé au premier texte analysé (import coûteux)
+        self._textblob = None
+
+        # Création du logger pour enregistrer les messages
+        self.logger = logging.getLogger(__name__)
+
+        # Message d'information indiquant que l'analyseur est initialisé
+        self.logger.info(
+            f"Analyseur initialisé - Seuils : Positif >= {positive_seuil}, Négatif <= {negative_seuil}, "
+            f"Lexique : {self.lexique.version}"
+        )
+
+    def preprocess_text(self, text: str) -> str:
+        return preprocess_text(text)
+
+    def _polarite_textblob(self, text: str) -> float:
+        """Score de polarité TextBlob, avec import paresseux."""
+        if self._textblob is None:
+            from textblob import TextBlob
+            self._textblob = TextBlob
+        return self._textblob(text).sentiment.polarity
+
+    def calculer_scores(self, text: str) -> Optional[tuple[float, float, float]]:
+        """
+        Calcule les scores continus d'un texte, avant arrondi et seuils :
+        - la polarité TextBlob (ajustée par les intensifieurs)
+        - le score des mots-clés
+        - le score final combiné
+        Retourne None si le texte est vide ou n'a pas pu être analysé.
+        """
+        # Les valeurs manquantes (None, NaN) ne sont pas des chaînes
+        if not isinstance(text, str) or not text:
+            return None
+
+        try:
+            # Nettoyage et normalisation du texte
+            text_clean = self.preprocess_text(text)
+
+            # Compter les mots-clés positifs et négatifs (pondérés par le lexique),
+            # en un seul parcours du texte par l'automate du lexique
+            sommes, nombres = self.lexique.compter(text_clean)
+            pos_count, neg_count = sommes[_POSITIFS], sommes[_NEGATIFS]
+
+            # Détecter présence d'intensifieurs
+            has_intensifier = nombres[_INTENSIFIEURS] > 0
+
+            # Score de polarité de base avec TextBlob
+            polarity = self._polarite_textblob(text_clean)
+
+            # Ajuster score si intensifieur détecté
+            if has_intensifier:
+                if pos_count > 0:
+                    polarity += 0.2  # intensifie le positif
+                elif neg_count > 0:
+                    polarity -= 0.2  # intensifie le négatif
+
+            # Score mots-clés normalisé
+            keyword_score = (pos_count - neg_count) * 0.15
+
+            # Combinaison finale : TextBlob + mots-clés
+            final_score = 0.5 * polarity + 0.5 * keyword_score
+
+            return polarity, keyword_score, final_score
+
+        except Exception as e:
+            # En cas d'erreur, log l'erreur (le texte sera classé neutre)
+            self.logger.error(f"Erreur lors de l'analyse du texte : {e}")
+            return None
+
+    def classer(self, score: float) -> SentimentLabel:
+        """Détermine le sentiment d'un score final selon les seuils."""
+        if score >= self.positive_seuil:
+            return "Positif"
+        elif score <= self.negative_seuil:
+            return "Negatif"
+        return "Neutre"
+
+    def analyse_text(self, text: str) -> tuple[SentimentLabel, float]:
+        """
+        Analyse un texte et retourne :
+        - le sentiment : Positif, Negatif, Neutre
+        - la polarité : score numérique entre -1 et 1
+        """
+        scores = self.calculer_scores(text)
+        if scores is None:
+            return "Neutre", 0.0
+
+        final_score = scores[2]
+        return self.classer(final_score), round(final_score, 2)
+
+    def _resultat(self, identifiant, text: str) -> ResultatAnalyse:
+        """Analyse un texte et construit son résultat compact."""
+        scores = self.calculer_scores(text)
+        if scores is None:
+            return ResultatAnalyse(identifiant, "Neutre", 0.0)
+
+        final_score = scores[2]
+        return ResultatAnalyse(identifiant, self.classer(final_score), round(final_score, 2), *scores)
+
+    def analyser_textes(self, textes: Iterable[str]) -> list[ResultatAnalyse]:
+        """Analyse une suite de textes ; l'identifiant est la position du texte."""
+        return [
+            self._resultat(i, text)
+            for i, text in enumerate(textes)
+        ]
+
+    def analyser_enregistrements(
+        self,
+        enregistrements: Iterable[dict],
+        text_column: str = "review_text",
+        id_column: str = "review_id",
+    ) -> list[ResultatAnalyse]:
+        """
+        Analyse une suite d'enregistrements (par exemple des avis JSON).
+        L'identifiant est lu dans id_column (None s'il est absent).
+        """
+        return [
+            self._resultat(record.get(id_column), record.get(text_column))
+            for record in enregistrements
+        ]
@@ -0,0 +1,180 @@
+"""
+Balayage et calibration des seuils de décision (POSITIVE_SEUIL / NEGATIVE_SEUIL).
+
+Le corpus est analysé une seule fois pour obtenir les scores continus
+(score_brut). Chaque couple de seuils est ensuite évalué par recherche
+dichotomique dans les scores triés : O(N log N) pour le tri, puis
+O(P log N) pour P couples, sans réanalyser les textes.
+
+Utilisation :
+    python -m src.calibration                      # analyse config.input_file
+    python -m src.calibration output/results.csv   # réutilise des scores déjà calculés
+"""
+import logging
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+LABELS = ("Positif", "Negatif", "Neutre")
+
+# Grille par défaut : pas de 0.01 sur [0, 0.5] et [-0.5, 0]
+SEUILS_POSITIFS = np.round(np.arange(0.0, 0.51, 0.01), 2)
+SEUILS_NEGATIFS = np.round(np.arange(-0.5, 0.01, 0.01), 2)
+
+
+def grille_seuils(seuils_positifs: Iterable[float], seuils_negatifs: Iterable[float]) -> tuple[np.ndarray, np.ndarray]:
+    """Produit tous les couples (positif, négatif) valides, c'est-à-dire avec positif > négatif."""
+    pos, neg = np.meshgrid(
+        np.asarray(list(seuils_positifs), dtype=float),
+        np.asarray(list(seuils_negatifs), dtype=float),
+        indexing="ij",
+    )
+    valides = pos > neg
+    return pos[valides], neg[valides]
+
+
+class BalayageSeuils:
+    """Évalue une grille de seuils sur des scores continus déjà calculés."""
+
+    def __init__(self, scores: Iterable[float], labels: Optional[Iterable[str]] = None):
+        """
+        scores : scores finaux avant arrondi (NaN = texte non analysé, toujours Neutre)
+        labels : sentiments attendus (Positif, Negatif, Neutre), optionnels ; toute autre
+                 valeur (vide, NaN, label inconnu) est considérée comme non étiquetée
+        """
+        scores = np.asarray(scores, dtype=float)
+        analyses = ~np.isnan(scores)
+
+        self.total = len(scores)
+        self._tries = np.sort(scores[analyses])
+
+        self.avec_labels = labels is not None
+        self._par_label = {}
+        self._effectifs = {}
+        if self.avec_labels:
+            labels = np.asarray(labels, dtype=object)
+            if len(labels) != self.total:
+                raise ValueError("Les scores et les labels doivent avoir la même longueur")
+
+            # Précision et exactitude se calculent sur les seules lignes étiquetées
+            etiquetes = np.isin(labels, LABELS)
+            self.nb_etiquetes = int(etiquetes.sum())
+            self._tries_etiquetes = np.sort(scores[etiquetes & analyses])
+            for label in LABELS:
+                masque = labels == label
+                self._effectifs[label] = int(masque.sum())
+                self._par_label[label] = np.sort(scores[masque & analyses])
+
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _compter(tries: np.ndarray, pos: np.ndarray, neg: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Nombre de scores >= pos et <= neg, pour chaque couple de seuils."""
+        nb_positifs = len(tries) - np.searchsorted(tries, pos, side="left")
+        nb_negatifs = np.searchsorted(tries, neg, side="right")
+        return nb_positifs, nb_negatifs
+
+    def evaluer(self, seuils_positifs: Iterable[float], seuils_negatifs: Iterable[float]) -> dict:
+        """
+        Évalue chaque couple (seuils_positifs[i], seuils_negatifs[i]).
+        Retourne un dictionnaire de colonnes (tableaux numpy de même longueur) :
+        répartition des labels et, si des labels sont fournis, précision et rappel par classe.
+        """
+        pos = np.asarray(list(seuils_positifs), dtype=float)
+        neg = np.asarray(list(seuils_negatifs), dtype=float)
+        if pos.shape != neg.shape:
+            raise ValueError("Il faut autant de seuils positifs que de seuils négatifs")
+        if np.any(pos <= neg):
+            raise ValueError("Chaque seuil positif doit être supérieur au seuil négatif associé")
+
+        nb_positifs, nb_negatifs = self._compter(self._tries, pos, neg)
+        predits = {
+            "Positif": nb_positifs,
+            "Negatif": nb_negatifs,
+            "Neutre": self.total - nb_positifs - nb_negatifs,
+        }
+
+        resultats = {"seuil_positif": pos, "seuil_negatif": neg}
+        for label in LABELS:
+            resultats[f"nb_{label.lower()}"] = predits[label]
+        for label in LABELS:
+            resultats[f"pct_{label.lower()}"] = np.round(predits[label] / max(self.total, 1) * 100, 2)
+
+        if self.avec_labels:
+            vrais = {}
+            vrais["Positif"] = self._compter(self._par_label["Positif"], pos, neg)[0]
+            vrais["Negatif"] = self._compter(self._par_label["Negatif"], pos, neg)[1]
+            pos_neutres, neg_neutres = self._compter(self._par_label["Neutre"], pos, neg)
+            vrais["Neutre"] = self._effectifs["Neutre"] - pos_neutres - neg_neutres
+
+            pos_etiquetes, neg_etiquetes = self._compter(self._tries_etiquetes, pos, neg)
+            predits_etiquetes = {
+                "Positif": pos_etiquetes,
+                "Negatif": neg_etiquetes,
+                "Neutre": self.nb_etiquetes - pos_etiquetes - neg_etiquetes,
+            }
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                for label in LABELS:
+                    resultats[f"precision_{label.lower()}"] = np.round(vrais[label] / predits_etiquetes[label], 4)
+                    resultats[f"rappel_{label.lower()}"] = np.round(vrais[label] / self._effectifs[label], 4)
+                resultats["exactitude"] = np.round(sum(vrais.values()) / self.nb_etiquetes, 4)
+
+        self.logger.info(
+            f"{len(pos)} couples de seuils évalués sur {self.total} scores"
+            + (f" ({self.nb_etiquetes} étiquetés)." if self.avec_labels else ".")
+        )
+        return resultats
+
+
+def executer_calibration(resultats_csv: Optional[str] = None) -> Path:
+    """
+    Analyse le corpus une fois (ou relit les scores de resultats_csv),
+    balaie la grille de seuils par défaut et écrit le rapport de calibration.
+    """
+    import pandas as pd
+    from src.config import Config
+
+    config = Config()
+    logger = logging.getLogger(__name__)
+
+    if resultats_csv:
+        df = pd.read_csv(resultats_csv)
+        if "score_brut" not in df.columns:
+            raise ValueError(
+                f"La colonne 'score_brut' est absente de {resultats_csv} "
+                f"(relancer l'analyse avec CONSERVER_SCORES_BRUTS=1)"
+            )
+        logger.info(f"Scores relus depuis {resultats_csv}: {len(df)} avis")
+    else:
+        from src.data_charge import DataCharger
+        from src.sentiments_analyse import SentimentAnalyzer
+
+        analyzer = SentimentAnalyzer(
+            positive_seuil=config.positive_seuil,
+            negative_seuil=config.negative_seuil,
+            lexique_artefact=config.lexique_artefact,
+            lexique_source=config.lexique_source
+        )
+        df = analyzer.analyse_dataframe(
+            DataCharger(config.input_file).load_data(),
+            text_column=config.text_column,
+            scores_bruts=True
+        )
+
+    labels = df[config.label_column] if config.label_column in df.columns else None
+    balayage = BalayageSeuils(df["score_brut"].to_numpy(), labels)
+    resultats = pd.DataFrame(balayage.evaluer(*grille_seuils(SEUILS_POSITIFS, SEUILS_NEGATIFS)))
+
+    sortie = Path(config.output_calibration)
+    sortie.parent.mkdir(parents=True, exist_ok=True)
+    resultats.to_csv(sortie, index=False, encoding="utf-8")
+    logger.info(f"Rapport de calibration écrit: {sortie}")
+    return sortie
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Rapport de calibration: {executer_calibration(sys.argv[1] if len(sys.argv) > 1 else None)}")
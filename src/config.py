@@ -12,6 +12,8 @@ class Config:
     input_file: str = os.getenv("INPUT_FILE", "data/reviews.js")
     output_csv: str = os.getenv("OUTPUT_CSV", "output/results.csv")
     output_summary: str = os.getenv("OUTPUT_SUMMARY", "output/summary.json")
+    output_calibration: str = os.getenv("OUTPUT_CALIBRATION", "output/calibration.csv")
+    output_termes: str = os.getenv("OUTPUT_TERMES", "output/termes_sketch.json")
     
     
 
@@ -23,6 +25,28 @@ class Config:
     #config donnees
 
     text_column: str = os.getenv("TEXT_COLUMN", "review_text")
+
+    label_column: str = os.getenv("LABEL_COLUMN", "sentiment_attendu")  # sentiment attendu (optionnel), utilisé par la calibration
+
+    conserver_scores_bruts: bool = os.getenv("CONSERVER_SCORES_BRUTS", "0") == "1"  # garde les scores avant seuils dans results.csv (utile à la calibration)
+    
+    top_k_termes: int = int(os.getenv("TOP_K_TERMES", "20"))  # termes fréquents par sentiment dans summary.json (0 = désactivé)
+
+    #config lexique
+
+    lexique_source: str = os.getenv("LEXIQUE_SOURCE", "data/lexique.json")  # lexique éditable (termes et poids)
+
+    lexique_artefact: str = os.getenv("LEXIQUE_ARTEFACT", "data/lexique.bin")  # compilé depuis la source au premier lancement
+    
+    #config détection des quasi-doublons (MinHash/LSH)
+
+    dedup_active: bool = os.getenv("DEDUP_ACTIVE", "0") == "1"  # désactivée par défaut : ajoute cluster_id et recopie le résultat du représentant
+
+    dedup_nb_permutations: int = int(os.getenv("DEDUP_NB_PERMUTATIONS", "128"))  # taille de la signature MinHash
+
+    dedup_seuil_similarite: float = float(os.getenv("DEDUP_SEUIL_SIMILARITE", "0.8"))  # similarité de Jaccard minimale
+
+    dedup_max_clusters: int = int(os.getenv("DEDUP_MAX_CLUSTERS", "100000"))  # borne la mémoire de l'index
     
     #config logging
 
@@ -31,4 +55,7 @@ class Config:
     def __post_init__(self): # sert à valider que les seuils définis dans la configuration ont un sens juste après la création de l’objet.
         
         if self.positive_seuil <= self.negative_seuil:
-            raise ValueError(f"Le seuil positif ({self.positive_seuil}) doit être supérieur au seuil négatif ({self.negative_seuil}).")
\ No newline at end of file
+            raise ValueError(f"Le seuil positif ({self.positive_seuil}) doit être supérieur au seuil négatif ({self.negative_seuil}).")
+
+        if not 0 < self.dedup_seuil_similarite <= 1:
+            raise ValueError(f"Le seuil de similarité ({self.dedup_seuil_similarite}) doit être compris dans ]0, 1].")
\ No newline at end of file
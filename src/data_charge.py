@@ -1,9 +1,11 @@
 import logging      # pour enregistrer des messages (infos, erreurs, etc.)
-import pandas as pd  # pour manipuler les tableaux de données
 import json          # pour lire/écrire des données JSON
 import re            # pour chercher des motifs dans du texte
 from pathlib import Path   # pour gérer les chemins de fichiers
-from typing import Optional  # pour indiquer qu'un argument peut être optionnel
+from typing import TYPE_CHECKING, Optional  # pour indiquer qu'un argument peut être optionnel
+
+if TYPE_CHECKING:
+    import pandas as pd  # importé seulement à l'usage : load_records n'en a pas besoin
 
 
 class DataCharger:
@@ -12,7 +14,7 @@ class DataCharger:
         self.file_path = Path(file_path)          # transforme le chemin en objet Path
         self.logger = logging.getLogger(__name__) # prépare le logger pour afficher des infos
 
-    def load_data(self) -> pd.DataFrame:
+    def load_data(self) -> "pd.DataFrame":
         # Vérifie que le fichier existe
         if not self.file_path.exists():
             raise FileNotFoundError(f"Fichier introuvable: {self.file_path}")
@@ -25,8 +27,22 @@ class DataCharger:
         self.validate_data(df)                                 # valide les données
         return df                                              # retourne le DataFrame
 
-    def load_js(self) -> pd.DataFrame:
+    def load_js(self) -> "pd.DataFrame":
         """Charge un fichier JavaScript contenant reviews = [...]"""
+        import pandas as pd  # pour manipuler les tableaux de données
+
+        data = self.load_records()
+        df = pd.DataFrame(data)  # transforme la liste Python en DataFrame
+        return df  # retourne le DataFrame
+
+    def load_records(self) -> list[dict]:
+        """
+        Lit le tableau reviews = [...] et retourne une liste de dict, sans importer pandas.
+        Adapté aux petits lots analysés avec MoteurSentiment.analyser_enregistrements.
+        """
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"Fichier introuvable: {self.file_path}")
+
         with open(self.file_path, 'r', encoding='utf-8') as f:
             content = f.read()  # lit tout le contenu du fichier
         
@@ -35,14 +51,13 @@ class DataCharger:
         if not match:
             raise ValueError("Tableau 'reviews' introuvable dans le fichier JS")
         
-        # Transforme le texte JSON en liste Python puis en DataFrame
+        # Transforme le texte JSON en liste Python
         data = json.loads(match.group(1))
-        df = pd.DataFrame(data)
         
         self.logger.info(f"Fichier JS parsé avec succès: {len(data)} avis trouvés")  # log info
-        return df  # retourne le DataFrame
+        return data
 
-    def validate_data(self, df: pd.DataFrame) -> None:
+    def validate_data(self, df: "pd.DataFrame") -> None:
         # Vérifie que le DataFrame n'est pas vide
         if df.empty:
             raise ValueError("Le DataFrame est vide")
@@ -0,0 +1,176 @@
+"""
+Détection des quasi-doublons (avis copiés-collés, modèles, spam) par
+signatures MinHash et index LSH (Locality Sensitive Hashing).
+"""
+import logging
+import zlib
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+# Nombre premier de Mersenne 2^31 - 1 : a * h + b tient dans un uint64
+_PREMIER = (1 << 31) - 1
+
+
+class DetecteurDoublons:
+    """
+    Regroupe les avis quasi identiques en clusters.
+
+    Chaque texte prétraité est découpé en shingles (n-grammes de caractères),
+    résumé par une signature MinHash, puis comparé uniquement aux clusters
+    qui partagent au moins une bande LSH : le coût par avis reste constant,
+    donc le traitement complet est sous-quadratique.
+
+    Les textes vides après prétraitement (valeurs manquantes, émojis ou
+    ponctuation seuls) ne sont rattachés à aucun cluster : ils n'ont aucun
+    contenu commun qui en ferait des doublons.
+
+    La mémoire est bornée par max_clusters : au-delà, les clusters les moins
+    récemment vus sont oubliés (un futur doublon ouvrira un nouveau cluster).
+    """
+
+    def __init__(
+        self,
+        preprocess: Callable[[str], str],
+        nb_permutations: int = 128,
+        seuil_similarite: float = 0.8,
+        taille_shingle: int = 5,
+        max_clusters: int = 100_000,
+        graine: int = 42,
+    ):
+        """
+        preprocess : fonction de nettoyage appliquée avant la signature
+        nb_permutations : taille de la signature MinHash
+        seuil_similarite : similarité de Jaccard estimée minimale pour regrouper deux avis
+        taille_shingle : longueur des n-grammes de caractères
+        max_clusters : nombre maximal de clusters gardés en mémoire
+        """
+        if nb_permutations <= 0:
+            raise ValueError("Le nombre de permutations doit être strictement positif.")
+        if not 0 < seuil_similarite <= 1:
+            raise ValueError(f"Le seuil de similarité ({seuil_similarite}) doit être dans ]0, 1].")
+        if max_clusters <= 0:
+            raise ValueError("Le nombre maximal de clusters doit être strictement positif.")
+
+        self.preprocess = preprocess
+        self.nb_permutations = nb_permutations
+        self.seuil_similarite = seuil_similarite
+        self.taille_shingle = taille_shingle
+        self.max_clusters = max_clusters
+
+        # Fonctions de hachage h(x) = (a * x + b) mod p, une par permutation
+        rng = np.random.default_rng(graine)
+        self._a = rng.integers(1, _PREMIER, size=nb_permutations, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, _PREMIER, size=nb_permutations, dtype=np.uint64)[:, None]
+
+        self.nb_bandes, self.lignes_par_bande = self._choisir_bandes(nb_permutations, seuil_similarite)
+
+        self.logger = logging.getLogger(__name__)
+        self.reinitialiser()
+
+    @staticmethod
+    def _choisir_bandes(nb_permutations: int, seuil: float) -> tuple[int, int]:
+        """
+        Choisit le découpage bandes x lignes dont le seuil LSH (1/b)^(1/r) est le plus
+        grand possible sans dépasser le seuil voulu : les paires proches du seuil restent
+        candidates, et la vérification des signatures écarte les faux candidats.
+        """
+        candidats = [
+            (nb_permutations // r, r)
+            for r in range(2, nb_permutations // 2 + 1)
+            if nb_permutations % r == 0
+        ]
+        if not candidats:
+            raise ValueError(
+                f"Le nombre de permutations ({nb_permutations}) doit pouvoir se découper "
+                f"en plusieurs bandes de plusieurs lignes (ex. 64, 128)."
+            )
+        sous_seuil = [br for br in candidats if (1 / br[0]) ** (1 / br[1]) <= seuil]
+        if not sous_seuil:
+            # Seuil très bas : le découpage le plus permissif
+            return min(candidats, key=lambda br: (1 / br[0]) ** (1 / br[1]))
+        return max(sous_seuil, key=lambda br: (1 / br[0]) ** (1 / br[1]))
+
+    def reinitialiser(self) -> None:
+        """Vide l'index (utile pour traiter un nouveau corpus indépendant)."""
+        self._bandes = [OrderedDict() for _ in range(self.nb_bandes)]
+        self._signatures: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._prochain_id = 0
+
+    def signature(self, text: str) -> np.ndarray:
+        """Calcule la signature MinHash du texte prétraité."""
+        return self._signature(self.preprocess(text))
+
+    def _signature(self, text: str) -> np.ndarray:
+        """Signature MinHash d'un texte déjà prétraité."""
+        k = self.taille_shingle
+        shingles = {text[i:i + k] for i in range(max(len(text) - k + 1, 1))}
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) % _PREMIER for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        return ((self._a * hashes + self._b) % _PREMIER).min(axis=1).astype(np.uint32)
+
+    def _cles(self, signature: np.ndarray) -> list[int]:
+        """Clés LSH d'une signature, une par bande."""
+        r = self.lignes_par_bande
+        return [hash(signature[i * r:(i + 1) * r].tobytes()) for i in range(self.nb_bandes)]
+
+    def _indexer(self, cles: list[int], cluster_id: int) -> None:
+        """(Ré)insère les clés d'un cluster en fin de bande, en évinçant les plus anciennes."""
+        for bande, cle in zip(self._bandes, cles):
+            bande[cle] = cluster_id
+            bande.move_to_end(cle)
+            if len(bande) > self.max_clusters:
+                bande.popitem(last=False)
+
+    def assigner(self, text: str) -> tuple[Optional[int], bool]:
+        """
+        Retourne (cluster_id, est_representant) pour un avis.
+        est_representant vaut True si l'avis ouvre un nouveau cluster.
+        Un texte vide après prétraitement retourne (None, True) : il est analysé seul.
+        """
+        text = self.preprocess(text)
+        if not text:
+            return None, True
+        signature = self._signature(text)
+        cles = self._cles(signature)
+
+        # Recherche des candidats partageant une bande, puis vérification de la similarité
+        for bande, cle in zip(self._bandes, cles):
+            cluster_id = bande.get(cle)
+            if cluster_id is None:
+                continue
+            representant = self._signatures.get(cluster_id)
+            if representant is None:
+                # Cluster oublié : l'entrée de bande est obsolète
+                del bande[cle]
+                continue
+            if np.mean(representant == signature) >= self.seuil_similarite:
+                # Cluster actif : ses clés de bande sont rafraîchies comme sa signature
+                self._signatures.move_to_end(cluster_id)
+                self._indexer(self._cles(representant), cluster_id)
+                return cluster_id, False
+
+        # Nouveau cluster
+        cluster_id = self._prochain_id
+        self._prochain_id += 1
+        self._signatures[cluster_id] = signature
+        if len(self._signatures) > self.max_clusters:
+            self._signatures.popitem(last=False)
+        self._indexer(cles, cluster_id)
+
+        return cluster_id, True
+
+    def assigner_clusters(self, textes: Iterable[str]) -> list[Optional[int]]:
+        """Assigne un cluster_id à chaque texte, dans l'ordre (None pour un texte vide)."""
+        cluster_ids = [self.assigner(text if isinstance(text, str) else "")[0] for text in textes]
+        nb_vides = cluster_ids.count(None)
+        self.logger.info(
+            f"Détection des doublons terminée : {len(cluster_ids)} avis, "
+            f"{len(set(cluster_ids)) - (nb_vides > 0)} clusters, {nb_vides} textes vides."
+        )
+        return cluster_ids
@@ -0,0 +1,372 @@
+"""
+Lexique de sentiment : compilation d'un fichier source (JSON) en artefact
+binaire versionné, puis chargement de cet artefact par mmap.
+
+L'artefact contient, en plus des termes et de leurs poids, l'automate de
+recherche (Aho-Corasick) déjà construit : un texte est parcouru une seule
+fois, octet par octet, quel que soit le nombre de termes. La recherche se
+fait directement dans le tampon projeté en mémoire, sans décoder les termes :
+les pages sont partagées entre tous les processus qui chargent l'artefact.
+
+Format de l'artefact (little-endian, sections alignées sur 8 octets) :
+- en-tête : magic "SLEX", version du format (u16), longueur de la version du lexique (u16),
+  puis la version du lexique en UTF-8
+- tailles : nombre de termes, d'états, de classes d'octets, taille du texte, nombre de sorties (u32)
+- poids des termes (f64 x termes)
+- classe de chaque octet (u8 x 256)
+- catégorie de chaque terme (u8 x termes)
+- offsets des termes dans le texte (u32 x termes+1)
+- transitions de l'automate (u32 x états x classes)
+- offsets des sorties de chaque état (u32 x états+1), puis les termes reconnus (u32 x sorties)
+- texte des termes en UTF-8
+
+Utilisation :
+    python -m src.lexique data/lexique.json data/lexique.bin
+
+Le pipeline (main.py) compile lui-même data/lexique.json vers data/lexique.bin
+au premier lancement, puis à chaque modification de la source.
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+CATEGORIES = ("positifs", "negatifs", "intensifieurs", "negations")
+
+MAGIC = b"SLEX"
+FORMAT_VERSION = 2
+
+_ENTETE = struct.Struct("<4sHH")
+_TAILLES = struct.Struct("<IIIII")
+
+logger = logging.getLogger(__name__)
+
+
+def _aligner(taille: int) -> int:
+    """Arrondit une taille au multiple de 8 supérieur."""
+    return (taille + 7) & ~7
+
+
+def _section(donnees: bytes) -> bytes:
+    """Complète une section par des zéros jusqu'à l'alignement."""
+    return donnees.ljust(_aligner(len(donnees)), b"\0")
+
+
+def _maximum(vue: memoryview, defaut: int) -> int:
+    """
+    Plus grande valeur d'une table (defaut - 1 si elle est vide).
+    Les grandes tables passent par numpy (sans copie) pour garder un chargement rapide.
+    """
+    if len(vue) == 0:
+        return defaut - 1
+    if len(vue) < 1_000_000:
+        return max(vue)
+    import numpy as np
+    return int(np.frombuffer(vue, dtype=np.dtype(vue.format).newbyteorder("<")).max())
+
+
+def _construire(version: str, categories: dict) -> bytes:
+    """
+    Construit l'artefact binaire : termes, poids et automate Aho-Corasick
+    déterminisé (une transition par état et par classe d'octet).
+    categories : {catégorie: [(terme, poids), ...]}
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("La compilation du lexique suppose une machine little-endian")
+
+    entrees = [
+        (indice, terme.encode("utf-8"), float(poids))
+        for indice, nom in enumerate(CATEGORIES)
+        for terme, poids in categories.get(nom, ())
+        if terme
+    ]
+
+    # Classes d'octets : 0 pour les octets absents de tous les termes
+    octets = sorted({octet for _, bloc, _ in entrees for octet in bloc})
+    classes = bytearray(256)
+    for classe, octet in enumerate(octets, start=1):
+        classes[octet] = classe
+    nb_classes = len(octets) + 1
+
+    # Trie des termes
+    enfants = [{}]
+    sorties = [[]]
+    for identifiant, (_, bloc, _) in enumerate(entrees):
+        etat = 0
+        for octet in bloc:
+            classe = classes[octet]
+            suivant = enfants[etat].get(classe)
+            if suivant is None:
+                suivant = len(enfants)
+                enfants[etat][classe] = suivant
+                enfants.append({})
+                sorties.append([])
+            etat = suivant
+        sorties[etat].append(identifiant)
+
+    # Liens d'échec en largeur : chaque ligne part de celle de son état d'échec
+    nb_etats = len(enfants)
+    transitions = array("I", [0]) * (nb_etats * nb_classes)
+    echec = [0] * nb_etats
+    file = deque()
+    for classe, suivant in enfants[0].items():
+        transitions[classe] = suivant
+        file.append(suivant)
+    while file:
+        etat = file.popleft()
+        base, base_echec = etat * nb_classes, echec[etat] * nb_classes
+        transitions[base:base + nb_classes] = transitions[base_echec:base_echec + nb_classes]
+        sorties[etat] = sorties[etat] + sorties[echec[etat]]
+        for classe, suivant in enfants[etat].items():
+            echec[suivant] = transitions[base_echec + classe]
+            transitions[base + classe] = suivant
+            file.append(suivant)
+
+    offsets_termes = array("I", [0])
+    for _, bloc, _ in entrees:
+        offsets_termes.append(offsets_termes[-1] + len(bloc))
+    offsets_sorties = array("I", [0])
+    for sortie in sorties:
+        offsets_sorties.append(offsets_sorties[-1] + len(sortie))
+    texte = b"".join(bloc for _, bloc, _ in entrees)
+
+    version_octets = version.encode("utf-8")
+    return b"".join([
+        _ENTETE.pack(MAGIC, FORMAT_VERSION, len(version_octets)),
+        _section(version_octets),
+        _section(_TAILLES.pack(len(entrees), nb_etats, nb_classes, len(texte), offsets_sorties[-1])),
+        _section(array("d", (poids for _, _, poids in entrees)).tobytes()),
+        bytes(classes),
+        _section(bytes(indice for indice, _, _ in entrees)),
+        _section(offsets_termes.tobytes()),
+        _section(transitions.tobytes()),
+        _section(offsets_sorties.tobytes()),
+        _section(array("I", (i for sortie in sorties for i in sortie)).tobytes()),
+        _section(texte),
+    ])
+
+
+class Lexique:
+    """Termes pondérés par catégorie et automate de recherche, lus dans un tampon binaire."""
+
+    def __init__(self, tampon: Union[bytes, mmap.mmap]):
+        """
+        tampon : artefact compilé (bytes en mémoire ou projection mmap).
+        Les tables sont des vues sur le tampon, sans copie.
+        """
+        vue = memoryview(tampon)
+        if len(vue) < _ENTETE.size:
+            raise ValueError("Le tampon est trop court pour être un artefact de lexique")
+        magic, format_version, taille_version = _ENTETE.unpack_from(vue, 0)
+        if magic != MAGIC:
+            raise ValueError("Le tampon n'est pas un artefact de lexique")
+        if format_version != FORMAT_VERSION:
+            raise ValueError(f"Version de format {format_version} non supportée (attendue: {FORMAT_VERSION})")
+
+        position = _aligner(_ENTETE.size + taille_version)
+        if len(vue) < position + _aligner(_TAILLES.size):
+            raise ValueError("Artefact tronqué : en-tête incomplet")
+        self.version = bytes(vue[_ENTETE.size:_ENTETE.size + taille_version]).decode("utf-8")
+
+        nb_termes, nb_etats, self._nb_classes, taille_texte, nb_sorties = _TAILLES.unpack_from(vue, position)
+        position += _aligner(_TAILLES.size)
+        if nb_etats == 0 or not 1 <= self._nb_classes <= 256:
+            raise ValueError("Artefact corrompu : automate invalide")
+
+        # Taille attendue d'après l'en-tête, vérifiée avant de créer les vues
+        tailles_sections = [
+            8 * nb_termes, 256, nb_termes, 4 * (nb_termes + 1),
+            4 * nb_etats * self._nb_classes, 4 * (nb_etats + 1), 4 * nb_sorties, taille_texte,
+        ]
+        fin = position + sum(_aligner(taille) for taille in tailles_sections)
+        if len(vue) != fin:
+            raise ValueError(f"Artefact tronqué ou corrompu : {len(vue)} octets, {fin} attendus")
+
+        def section(taille: int, format_: str = "B") -> memoryview:
+            nonlocal position
+            donnees = vue[position:position + taille]
+            position += _aligner(taille)
+            return donnees.cast(format_) if format_ != "B" else donnees
+
+        self._poids = section(8 * nb_termes, "d")
+        # Petite table lue à chaque octet : copiée pour un accès plus rapide
+        self._classes = bytes(section(256))
+        self._categories_termes = section(nb_termes)
+        self._offsets_termes = section(4 * (nb_termes + 1), "I")
+        self._transitions = section(4 * nb_etats * self._nb_classes, "I")
+        self._offsets_sorties = section(4 * (nb_etats + 1), "I")
+        self._sorties = section(4 * nb_sorties, "I")
+        self._texte = section(taille_texte)
+
+        # Les indices lus dans les tables doivent rester dans leurs bornes
+        if (
+            max(self._classes) >= self._nb_classes
+            or _maximum(self._categories_termes, len(CATEGORIES)) >= len(CATEGORIES)
+            or self._offsets_termes[-1] != taille_texte
+            or _maximum(self._offsets_termes, taille_texte + 1) > taille_texte
+            or _maximum(self._transitions, nb_etats) >= nb_etats
+            or self._offsets_sorties[0] != 0
+            or self._offsets_sorties[-1] != nb_sorties
+            or _maximum(self._offsets_sorties, nb_sorties + 1) > nb_sorties
+            or _maximum(self._sorties, nb_termes) >= nb_termes
+        ):
+            raise ValueError("Artefact corrompu : indices hors limites")
+
+        self._nb_termes = nb_termes
+        # Garde le tampon (et la projection mémoire) ouvert tant que le lexique est utilisé
+        self._tampon = tampon
+
+    @classmethod
+    def depuis_categories(cls, version: str, categories: dict) -> "Lexique":
+        """Construit un lexique en mémoire à partir de {catégorie: [(terme, poids), ...]}."""
+        return cls(_construire(version, categories))
+
+    @classmethod
+    def depuis_ensembles(cls, version: str, **ensembles: Iterable[str]) -> "Lexique":
+        """Construit un lexique de poids 1.0 à partir d'ensembles de termes."""
+        return cls.depuis_categories(
+            version, {nom: [(terme, 1.0) for terme in sorted(termes)] for nom, termes in ensembles.items()}
+        )
+
+    def vers_octets(self) -> bytes:
+        return bytes(self._tampon)
+
+    def terme(self, identifiant: int) -> str:
+        debut, fin = self._offsets_termes[identifiant], self._offsets_termes[identifiant + 1]
+        return str(self._texte[debut:fin], "utf-8")
+
+    def categorie(self, identifiant: int) -> str:
+        return CATEGORIES[self._categories_termes[identifiant]]
+
+    def items(self, categorie: str) -> tuple:
+        """Retourne les couples (terme, poids) d'une catégorie (décodés à la demande)."""
+        indice = CATEGORIES.index(categorie)
+        return tuple(
+            (self.terme(i), self._poids[i])
+            for i in range(self._nb_termes)
+            if self._categories_termes[i] == indice
+        )
+
+    def termes(self, categorie: str) -> set:
+        """Retourne l'ensemble des termes d'une catégorie."""
+        return {terme for terme, _ in self.items(categorie)}
+
+    def rechercher(self, text: str) -> set:
+        """Identifiants des termes présents dans le texte (recherche de sous-chaînes)."""
+        transitions, classes, nb_classes = self._transitions, self._classes, self._nb_classes
+        offsets, sorties = self._offsets_sorties, self._sorties
+
+        trouves = set()
+        etat = 0
+        for octet in text.encode("utf-8"):
+            etat = transitions[etat * nb_classes + classes[octet]]
+            debut, fin = offsets[etat], offsets[etat + 1]
+            if debut != fin:
+                trouves.update(sorties[debut:fin])
+        return trouves
+
+    def compter(self, text: str) -> tuple[list, list]:
+        """
+        Pour chaque catégorie (dans l'ordre de CATEGORIES), retourne la somme des poids
+        et le nombre de termes distincts présents dans le texte.
+        """
+        sommes = [0.0] * len(CATEGORIES)
+        nombres = [0] * len(CATEGORIES)
+        for identifiant in self.rechercher(text):
+            indice = self._categories_termes[identifiant]
+            sommes[indice] += self._poids[identifiant]
+            nombres[indice] += 1
+        return sommes, nombres
+
+    def __len__(self) -> int:
+        return self._nb_termes
+
+
+def lire_source(source: Union[str, Path]) -> Lexique:
+    """
+    Lit un lexique source JSON :
+    {"version": "1.0.0", "positifs": {"excellent": 1.0, ...}, "negations": ["pas", ...], ...}
+    Une catégorie donnée sous forme de liste reçoit des poids de 1.0.
+    """
+    with open(source, "r", encoding="utf-8") as f:
+        contenu = json.load(f)
+
+    if "version" not in contenu:
+        raise ValueError(f"Le lexique source {source} ne précise pas de version")
+
+    categories = {}
+    for nom in CATEGORIES:
+        entrees = contenu.get(nom, {})
+        if isinstance(entrees, list):
+            entrees = {terme: 1.0 for terme in entrees}
+        categories[nom] = sorted((str(terme).lower(), float(poids)) for terme, poids in entrees.items())
+
+    return Lexique.depuis_categories(str(contenu["version"]), categories)
+
+
+def compiler_lexique(source: Union[str, Path], artefact: Union[str, Path]) -> Lexique:
+    """Compile un lexique source JSON en artefact binaire."""
+    lexique = lire_source(source)
+
+    artefact = Path(artefact)
+    artefact.parent.mkdir(parents=True, exist_ok=True)
+    # Écriture dans un fichier temporaire puis remplacement atomique :
+    # un processus qui charge l'artefact en même temps ne voit jamais un fichier partiel
+    temporaire = artefact.with_name(f"{artefact.name}.{os.getpid()}.tmp")
+    with open(temporaire, "wb") as f:
+        f.write(lexique.vers_octets())
+    os.replace(temporaire, artefact)
+
+    logger.info(f"Lexique {lexique.version} compilé: {len(lexique)} termes -> {artefact}")
+    return lexique
+
+
+def charger_lexique(artefact: Union[str, Path]) -> Lexique:
+    """
+    Charge un artefact compilé par projection mémoire (mmap).
+    Les pages sont partagées entre les processus qui chargent le même fichier.
+    """
+    with open(artefact, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        lexique = Lexique(mm)
+    except ValueError as e:
+        raise ValueError(f"Fichier {artefact} invalide: {e}") from e
+
+    logger.info(f"Lexique {lexique.version} chargé depuis {artefact}")
+    return lexique
+
+
+def preparer_lexique(
+    source: Optional[Union[str, Path]] = None,
+    artefact: Optional[Union[str, Path]] = None,
+) -> Lexique:
+    """
+    Lexique du pipeline : l'artefact est compilé depuis la source au premier
+    usage, ou recompilé si la source est plus récente, puis chargé par mmap.
+    Sans artefact, la source est lue directement ; sans source, l'artefact est chargé tel quel.
+    """
+    if artefact is None:
+        return lire_source(source)
+
+    artefact = Path(artefact)
+    if source is not None and (
+        not artefact.exists() or artefact.stat().st_mtime < Path(source).stat().st_mtime
+    ):
+        compiler_lexique(source, artefact)
+    return charger_lexique(artefact)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m src.lexique <lexique_source.json> <artefact.bin>")
+        sys.exit(1)
+    logging.basicConfig(level=logging.INFO)
+    compiler_lexique(sys.argv[1], sys.argv[2])
@@ -2,29 +2,79 @@
 import json
 import pandas as pd
 from pathlib import Path
+from typing import Optional
+from src.lexique import Lexique
+from src.sketches import ProfilsTermes
 
 
 class Generateur_rapport:
     """Génère les rapports CSV et JSON."""
 
-    def __init__(self, output_csv: str, output_summary: str):
+    def __init__(
+        self,
+        output_csv: str,
+        output_summary: str,
+        output_termes: Optional[str] = None,
+        top_k: int = 20,
+        lexique: Optional[Lexique] = None,
+        text_column: str = "review_text",
+    ):
+        """
+        output_termes : fichier où sauvegarder l'état des sketches de termes (fusionnable)
+        top_k : nombre de termes fréquents par sentiment dans le résumé (0 pour désactiver)
+        lexique : lexique dont on compte les termes rencontrés
+        """
         self.output_csv = Path(output_csv)
         self.output_summary = Path(output_summary)
+        self.output_termes = Path(output_termes) if output_termes else None
+        self.top_k = top_k
+        self.lexique = lexique
+        self.text_column = text_column
         self.output_csv.parent.mkdir(parents=True, exist_ok=True)
 
     def generer_rapports(self, df: pd.DataFrame):
         """Génère tous les rapports."""
         self.save_details_results(df)
-        self.save_summary(df)
+
+        profils = None
+        if self.top_k > 0 and self.text_column in df.columns:
+            profils = self.calculer_termes_frequents(df)
+            if self.output_termes:
+                self.save_termes(profils)
+
+        self.save_summary(df, profils)
         print(f"Rapports générés: {self.output_csv} et {self.output_summary}")
 
+    def calculer_termes_frequents(self, df: pd.DataFrame, profils: Optional[ProfilsTermes] = None) -> ProfilsTermes:
+        """
+        Compte en flux les unigrammes, bigrammes et termes du lexique par sentiment_final.
+        Passer des profils existants (bloc ou exécution précédente) pour cumuler les comptes.
+        """
+        if profils is None:
+            profils = ProfilsTermes(self.lexique, capacite=max(10 * self.top_k, 100))
+        profils.ajouter_textes(df[self.text_column], df['sentiment_final'])
+        return profils
+
+    def save_termes(self, profils: ProfilsTermes):
+        """Sauvegarde l'état des sketches pour une fusion ultérieure."""
+        self.output_termes.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.output_termes, 'w', encoding='utf-8') as f:
+            json.dump(profils.vers_dict(), f, ensure_ascii=False)
+
+    def charger_termes(self, chemin: str) -> ProfilsTermes:
+        """Recharge l'état des sketches sauvegardé par save_termes."""
+        with open(chemin, 'r', encoding='utf-8') as f:
+            return ProfilsTermes.depuis_dict(json.load(f), self.lexique)
+
     def save_details_results(self, df: pd.DataFrame):
         """Sauvegarde le CSV détaillé."""
         df.to_csv(self.output_csv, index=False, encoding='utf-8')
 
-    def save_summary(self, df: pd.DataFrame):
+    def save_summary(self, df: pd.DataFrame, profils: Optional[ProfilsTermes] = None):
         """Sauvegarde le résumé JSON."""
         summary = self.calculer_statistiques(df)
+        if profils is not None:
+            summary["termes_frequents"] = profils.top(self.top_k)
         with open(self.output_summary, 'w', encoding='utf-8') as f:
             json.dump(summary, f, indent=2, ensure_ascii=False)
 
@@ -46,8 +96,23 @@ class Generateur_rapport:
 
         score_moyen = round(df['polarite'].mean(), 3) if 'polarite' in df.columns else 0.0
 
-        return {
+        summary = {
             "total_avis_analyses": total,
             "statistiques": stats,
             "score_moyen_polarite": score_moyen
         }
+
+        if 'version_lexique' in df.attrs:
+            summary["version_lexique"] = df.attrs['version_lexique']
+
+        if 'cluster_id' in df.columns:
+            # Les textes vides (cluster_id manquant) ne sont pas des doublons
+            nb_clusters = int(df['cluster_id'].nunique())
+            nb_dupliques = int(df['cluster_id'].notna().sum()) - nb_clusters
+            summary["doublons"] = {
+                "nombre_clusters": nb_clusters,
+                "avis_dupliques": nb_dupliques,
+                "pourcentage_dupliques": round(nb_dupliques / total * 100, 2) if total else 0.0
+            }
+
+        return summary
@@ -0,0 +1,288 @@
+"""
+Structures de comptage en mémoire bornée pour les fréquences de termes.
+
+- CountMinSketch : estime le nombre d'occurrences de n'importe quel terme
+  (surestimation bornée, jamais de sous-estimation).
+- SpaceSaving : garde les termes les plus fréquents (heavy hitters) avec un
+  nombre fixe de compteurs.
+
+Les deux structures sont fusionnables : on peut compter chaque bloc de
+données (ou chaque exécution) séparément puis additionner les résultats.
+Le hachage est déterministe, donc des sketches produits par des processus
+ou des exécutions différentes restent compatibles.
+"""
+import hashlib
+import heapq
+from collections import Counter
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from src.analyse_noyau import preprocess_text
+from src.lexique import Lexique
+
+# Mots très fréquents sans intérêt pour expliquer un sentiment
+MOTS_VIDES = {
+    'le', 'la', 'les', 'un', 'une', 'des', 'de', 'du', 'au', 'aux', 'et', 'ou',
+    'à', 'a', 'en', 'dans', 'sur', 'pour', 'par', 'avec', 'ce', 'cet', 'cette',
+    'ces', 'c', 'est', 'je', 'j', 'tu', 'il', 'elle', 'on', 'nous', 'vous', 'ils',
+    'elles', 'me', 'm', 'se', 's', 'l', 'd', 'qu', 'que', 'qui', 'mon', 'ma', 'mes',
+    'son', 'sa', 'ses', 'leur', 'été', 'était', 'suis', 'ai', 'y', 'mais', 'ni', 'ne',
+    # formes contractées après suppression de l'apostrophe par le prétraitement
+    'cest', 'jai', 'quil', 'quelle', 'cétait', 'jétais',
+}
+
+
+def _plus_grands(k: int, items: Iterable[tuple[str, int]]) -> list[tuple[str, int]]:
+    """Les k couples (terme, compte) les plus grands, à égalité par ordre alphabétique."""
+    return heapq.nsmallest(k, items, key=lambda item: (-item[1], item[0]))
+
+
+class CountMinSketch:
+    """Tableau profondeur x largeur de compteurs, une fonction de hachage par ligne."""
+
+    def __init__(self, largeur: int = 2048, profondeur: int = 4):
+        if largeur <= 0 or profondeur <= 0:
+            raise ValueError("La largeur et la profondeur doivent être strictement positives.")
+        self.largeur = largeur
+        self.profondeur = profondeur
+        self.table = np.zeros((profondeur, largeur), dtype=np.int64)
+        self._lignes = np.arange(profondeur)
+        self._rangs = np.arange(profondeur, dtype=np.uint64)
+
+    def _colonnes(self, termes: Sequence[str]) -> np.ndarray:
+        """
+        Colonnes de chaque terme dans chaque ligne (double hachage h1 + i * h2),
+        calculées en un seul passage numpy : tableau termes x profondeur.
+        """
+        empreintes = b"".join(hashlib.blake2b(terme.encode("utf-8"), digest_size=16).digest() for terme in termes)
+        h = np.frombuffer(empreintes, dtype="<u8").reshape(-1, 2)
+        # h1 et h2 réduits modulo la largeur : pas de dépassement de uint64
+        h1 = h[:, :1] % np.uint64(self.largeur)
+        h2 = (h[:, 1:] | np.uint64(1)) % np.uint64(self.largeur)
+        colonnes = (h1 + self._rangs * h2) % np.uint64(self.largeur)
+        return colonnes.astype(np.intp)
+
+    def ajouter_lot(self, termes: Sequence[str], nombres: Union[int, Sequence[int]] = 1) -> None:
+        """Ajoute un lot de termes (un nombre par terme ou le même pour tous)."""
+        if not termes:
+            return
+        nombres = np.asarray(nombres, dtype=np.int64).reshape(-1, 1)
+        np.add.at(self.table, (self._lignes, self._colonnes(termes)), nombres)
+
+    def ajouter(self, terme: str, nombre: int = 1) -> None:
+        self.ajouter_lot([terme], nombre)
+
+    def estimer(self, terme: str) -> int:
+        return int(self.table[self._lignes, self._colonnes([terme])[0]].min())
+
+    def fusionner(self, autre: "CountMinSketch") -> None:
+        """Ajoute les compteurs d'un autre sketch de mêmes dimensions."""
+        if self.table.shape != autre.table.shape:
+            raise ValueError("Impossible de fusionner des Count-Min Sketch de dimensions différentes")
+        self.table += autre.table
+
+    def vers_dict(self) -> dict:
+        return {"largeur": self.largeur, "profondeur": self.profondeur, "table": self.table.tolist()}
+
+    @classmethod
+    def depuis_dict(cls, data: dict) -> "CountMinSketch":
+        sketch = cls(data["largeur"], data["profondeur"])
+        sketch.table = np.asarray(data["table"], dtype=np.int64)
+        return sketch
+
+
+class SpaceSaving:
+    """
+    Algorithme SpaceSaving : au plus `capacite` compteurs. Un nouveau terme
+    remplace le moins fréquent et hérite de son compte (borne d'erreur).
+    """
+
+    def __init__(self, capacite: int = 200):
+        if capacite <= 0:
+            raise ValueError("La capacité doit être strictement positive.")
+        self.capacite = capacite
+        self.compteurs: dict[str, int] = {}
+        # Tas (compte, terme) : une entrée par terme suivi, dont le compte peut être
+        # en retard (les comptes ne font que croître) et n'est mis à jour qu'à l'éviction
+        self._tas: list[tuple[int, str]] = []
+
+    def _minimum(self) -> tuple[int, str]:
+        """Retourne le compteur le plus faible en mettant à jour les entrées en retard du tas."""
+        while True:
+            compte, terme = self._tas[0]
+            actuel = self.compteurs[terme]
+            if actuel == compte:
+                return compte, terme
+            heapq.heapreplace(self._tas, (actuel, terme))
+
+    def ajouter(self, terme: str, nombre: int = 1) -> None:
+        if terme in self.compteurs:
+            self.compteurs[terme] += nombre
+        elif len(self.compteurs) < self.capacite:
+            self.compteurs[terme] = nombre
+            heapq.heappush(self._tas, (nombre, terme))
+        else:
+            compte_min, terme_min = self._minimum()
+            del self.compteurs[terme_min]
+            self.compteurs[terme] = compte_min + nombre
+            heapq.heapreplace(self._tas, (compte_min + nombre, terme))
+
+    def fusionner(self, autre: "SpaceSaving") -> None:
+        """
+        Fusion de deux résumés : un terme absent d'un résumé plein y compte
+        pour le minimum de ce résumé, puis seuls les plus grands compteurs sont gardés.
+        """
+        min_self = min(self.compteurs.values()) if len(self.compteurs) >= self.capacite else 0
+        min_autre = min(autre.compteurs.values()) if len(autre.compteurs) >= autre.capacite else 0
+
+        fusion = {
+            terme: self.compteurs.get(terme, min_self) + autre.compteurs.get(terme, min_autre)
+            for terme in self.compteurs.keys() | autre.compteurs.keys()
+        }
+        self.compteurs = dict(heapq.nlargest(self.capacite, fusion.items(), key=lambda item: item[1]))
+        self._tas = [(compte, t) for t, compte in self.compteurs.items()]
+        heapq.heapify(self._tas)
+
+    def top(self, k: int) -> list[tuple[str, int]]:
+        return _plus_grands(k, self.compteurs.items())
+
+    def vers_dict(self) -> dict:
+        return {"capacite": self.capacite, "compteurs": self.compteurs}
+
+    @classmethod
+    def depuis_dict(cls, data: dict) -> "SpaceSaving":
+        resume = cls(data["capacite"])
+        resume.compteurs = {terme: int(compte) for terme, compte in data["compteurs"].items()}
+        resume._tas = [(compte, t) for t, compte in resume.compteurs.items()]
+        heapq.heapify(resume._tas)
+        return resume
+
+
+class TermesFrequents:
+    """
+    Top-k d'un flux de termes : SpaceSaving choisit les candidats,
+    le Count-Min Sketch resserre leur compte (minimum des deux estimations).
+    """
+
+    def __init__(self, capacite: int = 200, largeur: int = 2048, profondeur: int = 4):
+        self.sketch = CountMinSketch(largeur, profondeur)
+        self.resume = SpaceSaving(capacite)
+
+    def ajouter(self, terme: str, nombre: int = 1) -> None:
+        self.sketch.ajouter(terme, nombre)
+        self.resume.ajouter(terme, nombre)
+
+    def ajouter_termes(self, termes: Iterable[str]) -> None:
+        """Ajoute les termes d'un avis : un seul passage dans le sketch pour tout le lot."""
+        comptes = Counter(termes)
+        self.sketch.ajouter_lot(list(comptes), list(comptes.values()))
+        for terme, nombre in comptes.items():
+            self.resume.ajouter(terme, nombre)
+
+    def fusionner(self, autre: "TermesFrequents") -> None:
+        self.sketch.fusionner(autre.sketch)
+        self.resume.fusionner(autre.resume)
+
+    def top(self, k: int) -> list[dict]:
+        estimations = (
+            (terme, min(compte, self.sketch.estimer(terme)))
+            for terme, compte in self.resume.compteurs.items()
+        )
+        return [
+            {"terme": terme, "nombre": nombre}
+            for terme, nombre in _plus_grands(k, estimations)
+        ]
+
+    def vers_dict(self) -> dict:
+        return {"sketch": self.sketch.vers_dict(), "resume": self.resume.vers_dict()}
+
+    @classmethod
+    def depuis_dict(cls, data: dict) -> "TermesFrequents":
+        termes = cls.__new__(cls)
+        termes.sketch = CountMinSketch.depuis_dict(data["sketch"])
+        termes.resume = SpaceSaving.depuis_dict(data["resume"])
+        return termes
+
+
+class ProfilsTermes:
+    """
+    Fréquences des unigrammes, bigrammes et termes du lexique, par sentiment.
+    La mémoire est fixe : 3 structures TermesFrequents par sentiment rencontré.
+    """
+
+    TYPES = ("unigrammes", "bigrammes", "lexique")
+
+    def __init__(self, lexique: Optional[Lexique] = None, capacite: int = 200, largeur: int = 2048, profondeur: int = 4):
+        self.capacite = capacite
+        self.largeur = largeur
+        self.profondeur = profondeur
+        self.profils: dict[str, dict[str, TermesFrequents]] = {}
+        self.lexique = lexique
+
+    def _profil(self, sentiment: str) -> dict[str, TermesFrequents]:
+        if sentiment not in self.profils:
+            self.profils[sentiment] = {
+                type_terme: TermesFrequents(self.capacite, self.largeur, self.profondeur)
+                for type_terme in self.TYPES
+            }
+        return self.profils[sentiment]
+
+    def ajouter_texte(self, text: str, sentiment: str) -> None:
+        """Compte les termes d'un avis dans le profil de son sentiment."""
+        text_clean = preprocess_text(text) if isinstance(text, str) else ""
+        if not text_clean:
+            return
+        profil = self._profil(sentiment)
+
+        mots = text_clean.split()
+        profil["unigrammes"].ajouter_termes(mot for mot in mots if mot not in MOTS_VIDES)
+        profil["bigrammes"].ajouter_termes(
+            f"{premier} {second}"
+            for premier, second in zip(mots, mots[1:])
+            if premier not in MOTS_VIDES or second not in MOTS_VIDES
+        )
+        # Même recherche que l'analyseur (automate du lexique), un compte par terme distinct
+        if self.lexique is not None:
+            profil["lexique"].ajouter_termes({
+                self.lexique.terme(identifiant)
+                for identifiant in self.lexique.rechercher(text_clean)
+                if self.lexique.categorie(identifiant) in ("positifs", "negatifs")
+            })
+
+    def ajouter_textes(self, textes: Iterable[str], sentiments: Iterable[str]) -> None:
+        """Compte un bloc d'avis (peut être appelé bloc par bloc)."""
+        for text, sentiment in zip(textes, sentiments):
+            self.ajouter_texte(text, sentiment)
+
+    def fusionner(self, autre: "ProfilsTermes") -> None:
+        """Ajoute les comptes d'un autre profil (autre bloc ou autre exécution)."""
+        for sentiment, profil in autre.profils.items():
+            for type_terme, termes in profil.items():
+                self._profil(sentiment)[type_terme].fusionner(termes)
+
+    def top(self, k: int) -> dict:
+        return {
+            sentiment: {type_terme: termes.top(k) for type_terme, termes in profil.items()}
+            for sentiment, profil in self.profils.items()
+        }
+
+    def vers_dict(self) -> dict:
+        return {
+            "capacite": self.capacite,
+            "largeur": self.largeur,
+            "profondeur": self.profondeur,
+            "profils": {
+                sentiment: {type_terme: termes.vers_dict() for type_terme, termes in profil.items()}
+                for sentiment, profil in self.profils.items()
+            },
+        }
+
+    @classmethod
+    def depuis_dict(cls, data: dict, lexique: Optional[Lexique] = None) -> "ProfilsTermes":
+        profils = cls(lexique, data["capacite"], data["largeur"], data["profondeur"])
+        profils.profils = {
+            sentiment: {type_terme: TermesFrequents.depuis_dict(etat) for type_terme, etat in profil.items()}
+            for sentiment, profil in data["profils"].items()
+        }
+        return profils
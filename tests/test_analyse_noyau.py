@@ -0,0 +1,42 @@
+import subprocess
+import sys
+from src.analyse_noyau import MoteurSentiment, ResultatAnalyse
+from src.data_charge import DataCharger
+
+
+class TestMoteurSentiment:
+    """Tests pour le noyau d'analyse sans pandas."""
+
+    def setup_method(self):
+        """Crée un nouveau moteur avant chaque test."""
+        self.moteur = MoteurSentiment(positive_seuil=0.1, negative_seuil=-0.1)
+
+    def test_import_sans_pandas(self):
+        """Charger les avis et utiliser le noyau ne charge pas pandas."""
+        code = (
+            "import sys; from src.analyse_noyau import MoteurSentiment; "
+            "from src.data_charge import DataCharger; "
+            "records = DataCharger('data/reviews.js').load_records(); "
+            "MoteurSentiment().analyser_enregistrements(records[:2]); "
+            "assert 'pandas' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_analyser_textes(self):
+        """Chaque texte donne un résultat compact, dans l'ordre."""
+        resultats = self.moteur.analyser_textes(["Excellent produit, je le recommande !", "", None])
+
+        assert all(isinstance(r, ResultatAnalyse) for r in resultats)
+        assert [r.identifiant for r in resultats] == [0, 1, 2]
+        assert resultats[0].sentiment == "Positif"
+        assert tuple(resultats[1]) == ("Neutre", 0.0)
+        assert tuple(resultats[2]) == ("Neutre", 0.0)
+
+    def test_analyser_enregistrements(self):
+        """Les enregistrements chargés sans DataFrame sont analysés avec leur identifiant."""
+        records = DataCharger("data/reviews.js").load_records()[:3]
+        resultats = self.moteur.analyser_enregistrements(records)
+
+        assert [r.identifiant for r in resultats] == ["REV001", "REV002", "REV003"]
+        assert resultats[0].sentiment == "Positif"
+        assert resultats[1].sentiment == "Negatif"
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from src.analyse_noyau import MoteurSentiment
+from src.calibration import BalayageSeuils, grille_seuils
+
+
+class TestBalayageSeuils:
+    """Tests pour le balayage vectorisé des seuils."""
+
+    def test_grille_couples_valides(self):
+        """La grille ne garde que les couples avec seuil positif > seuil négatif."""
+        pos, neg = grille_seuils([0.0, 0.1], [-0.1, 0.0, 0.1])
+
+        assert list(zip(pos, neg)) == [(0.0, -0.1), (0.1, -0.1), (0.1, 0.0)]
+
+    def test_repartition_identique_au_moteur(self):
+        """La répartition balayée correspond au classement du moteur pour chaque couple."""
+        scores = np.array([-0.4, -0.1, -0.05, 0.0, 0.05, 0.1, 0.3, np.nan])
+        pos, neg = grille_seuils([0.05, 0.1, 0.2], [-0.2, -0.1, 0.0])
+        resultats = BalayageSeuils(scores).evaluer(pos, neg)
+
+        for i, (p, n) in enumerate(zip(pos, neg)):
+            moteur = MoteurSentiment(positive_seuil=p, negative_seuil=n)
+            labels = [moteur.classer(s) if not np.isnan(s) else "Neutre" for s in scores]
+            assert resultats["nb_positif"][i] == labels.count("Positif")
+            assert resultats["nb_negatif"][i] == labels.count("Negatif")
+            assert resultats["nb_neutre"][i] == labels.count("Neutre")
+
+    def test_precision_rappel(self):
+        """Précision et rappel sont calculés quand les labels attendus sont fournis."""
+        scores = [0.5, 0.3, -0.3, 0.0, 0.2]
+        labels = ["Positif", "Positif", "Negatif", "Neutre", "Neutre"]
+        resultats = BalayageSeuils(scores, labels).evaluer([0.1, 0.25], [-0.1, -0.1])
+
+        # Seuil positif 0.1 : 3 prédits positifs dont 2 corrects
+        assert resultats["precision_positif"][0] == pytest.approx(0.6667)
+        assert resultats["rappel_positif"][0] == 1.0
+        assert resultats["rappel_neutre"][0] == 0.5
+        # Seuil positif 0.25 : tout est correct
+        assert resultats["exactitude"][1] == 1.0
+
+    def test_labels_partiels(self):
+        """Les lignes sans label (ou avec un label inconnu) sont exclues de la précision et de l'exactitude."""
+        scores = [0.5, 0.4, -0.3, 0.0, 0.2]
+        labels = ["Positif", None, "Negatif", "Neutre", "inconnu"]
+        resultats = BalayageSeuils(scores, labels).evaluer([0.1], [-0.1])
+
+        # La répartition porte toujours sur toutes les lignes
+        assert resultats["nb_positif"][0] == 3
+        assert resultats["precision_positif"][0] == 1.0
+        assert resultats["precision_negatif"][0] == 1.0
+        assert resultats["precision_neutre"][0] == 1.0
+        assert resultats["exactitude"][0] == 1.0
+
+    def test_couple_invalide(self):
+        """Un seuil positif inférieur au seuil négatif est refusé."""
+        with pytest.raises(ValueError):
+            BalayageSeuils([0.0]).evaluer([-0.2], [0.1])
+
+    def test_scores_bruts_conserves(self):
+        """Le moteur garde le score continu avant arrondi."""
+        resultat = MoteurSentiment().analyser_textes(["Excellent produit, je le recommande !"])[0]
+
+        assert resultat.polarite == round(resultat.score_brut, 2)
+        assert resultat.score_brut == pytest.approx(0.5 * resultat.polarite_textblob + 0.5 * resultat.score_mots_cles)
@@ -0,0 +1,123 @@
+import random
+import pytest
+import pandas as pd
+from src.doublons import DetecteurDoublons
+from src.rapport_generateur import Generateur_rapport
+from src.sentiments_analyse import SentimentAnalyzer
+
+
+class TestDetecteurDoublons:
+    """Tests pour la détection des quasi-doublons MinHash/LSH."""
+
+    def setup_method(self):
+        """Crée un analyseur et un détecteur neufs avant chaque test."""
+        self.analyser = SentimentAnalyzer()
+        self.detecteur = DetecteurDoublons(preprocess=self.analyser.preprocess_text)
+
+    def test_quasi_doublons_meme_cluster(self):
+        """Des variantes d'un même avis modèle partagent un cluster."""
+        textes = [
+            "Excellent produit, je le recommande à tout le monde !",
+            "Excellent produit je le recommande à tout le monde",
+            "EXCELLENT PRODUIT, je le recommande à tout le monde !!!",
+            "La livraison a pris trois semaines, colis abîmé.",
+        ]
+        cluster_ids = self.detecteur.assigner_clusters(textes)
+
+        assert cluster_ids[0] == cluster_ids[1] == cluster_ids[2]
+        assert cluster_ids[3] != cluster_ids[0]
+
+    def test_textes_differents_clusters_distincts(self):
+        """Des avis sans rapport ouvrent chacun leur cluster."""
+        textes = [
+            "Le service client était absolument horrible.",
+            "J'adore les nouvelles fonctionnalités !",
+            "Produit conforme à la description.",
+        ]
+        assert len(set(self.detecteur.assigner_clusters(textes))) == 3
+
+    def test_memoire_bornee(self):
+        """L'index ne garde jamais plus de max_clusters représentants."""
+        detecteur = DetecteurDoublons(preprocess=self.analyser.preprocess_text, max_clusters=5)
+        detecteur.assigner_clusters(f"avis numéro {i} totalement unique {i * 7919}" for i in range(50))
+
+        assert len(detecteur._signatures) <= 5
+        assert all(len(bande) <= 5 for bande in detecteur._bandes)
+
+    def test_rappel_pres_du_seuil(self):
+        """Les paires de similarité de Jaccard entre 0.85 et 0.95 sont presque toutes regroupées."""
+        rng = random.Random(0)
+        mots = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 8))) for _ in range(2000)]
+
+        def shingles(text):
+            text = self.analyser.preprocess_text(text)
+            return {text[i:i + 5] for i in range(len(text) - 4)}
+
+        regroupees = []
+        while len(regroupees) < 300:
+            base = [rng.choice(mots) for _ in range(60)]
+            variante = list(base)
+            for _ in range(rng.randint(1, 3)):
+                variante[rng.randrange(60)] = rng.choice(mots)
+            a, b = " ".join(base), " ".join(variante)
+            jaccard = len(shingles(a) & shingles(b)) / len(shingles(a) | shingles(b))
+            if not 0.85 <= jaccard <= 0.95:
+                continue
+            self.detecteur.reinitialiser()
+            regroupees.append(self.detecteur.assigner(a)[0] == self.detecteur.assigner(b)[0])
+
+        assert sum(regroupees) / len(regroupees) >= 0.95
+
+    def test_permutations_sans_decoupage(self):
+        """Un nombre premier de permutations ne permet pas de découpage en bandes et est refusé."""
+        with pytest.raises(ValueError, match="bandes"):
+            DetecteurDoublons(preprocess=self.analyser.preprocess_text, nb_permutations=127)
+
+    def test_cluster_actif_garde_ses_bandes(self):
+        """Un modèle qui revient souvent reste dans son cluster malgré l'arrivée de nouveaux clusters."""
+        detecteur = DetecteurDoublons(preprocess=self.analyser.preprocess_text, max_clusters=5)
+        modele = "Excellent produit, je le recommande à tout le monde !"
+        cluster_modele = detecteur.assigner(modele)[0]
+
+        for i in range(20):
+            for j in range(3):
+                detecteur.assigner(f"avis unique {i} {j} sans rapport {i * 7919 + j}")
+            assert detecteur.assigner(modele + "!" * (i % 3))[0] == cluster_modele
+
+    def test_seuil_invalide(self):
+        """Un seuil de similarité hors de ]0, 1] est refusé."""
+        with pytest.raises(ValueError):
+            DetecteurDoublons(preprocess=self.analyser.preprocess_text, seuil_similarite=1.5)
+
+    def test_propagation_et_resume(self):
+        """Le résultat du représentant est propagé et les doublons comptés dans le résumé."""
+        df = pd.DataFrame({"review_text": [
+            "Excellent produit, je le recommande !",
+            "Excellent produit, je le recommande !!",
+            "Le service client était absolument horrible.",
+        ]})
+        analysed = self.analyser.analyse_dataframe(df, detecteur_doublons=self.detecteur)
+
+        assert "cluster_id" in analysed.columns
+        assert analysed["sentiment_final"].iloc[0] == analysed["sentiment_final"].iloc[1]
+        assert analysed["polarite"].iloc[0] == analysed["polarite"].iloc[1]
+
+        generator = Generateur_rapport("output/test_results.csv", "output/test_summary.json")
+        doublons = generator.calculer_statistiques(analysed)["doublons"]
+        assert doublons["nombre_clusters"] == 2
+        assert doublons["avis_dupliques"] == 1
+
+    def test_textes_vides_hors_clusters(self):
+        """Valeurs manquantes, textes vides et émojis seuls ne forment pas un cluster de doublons."""
+        df = pd.DataFrame({"review_text": [None, "", "😒", "!!!", "Produit conforme à la description."]})
+        analysed = self.analyser.analyse_dataframe(df, detecteur_doublons=self.detecteur, scores_bruts=True)
+        sans_doublons = self.analyser.analyse_dataframe(df, scores_bruts=True)
+
+        assert analysed["cluster_id"].isna().tolist() == [True, True, True, True, False]
+        pd.testing.assert_series_equal(analysed["score_brut"], sans_doublons["score_brut"])
+        assert analysed["score_brut"].iloc[2] == 0.0
+
+        generator = Generateur_rapport("output/test_results.csv", "output/test_summary.json")
+        doublons = generator.calculer_statistiques(analysed)["doublons"]
+        assert doublons["nombre_clusters"] == 1
+        assert doublons["avis_dupliques"] == 0
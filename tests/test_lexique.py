@@ -0,0 +1,98 @@
+import pytest
+import pandas as pd
+import os
+from src.lexique import compiler_lexique, charger_lexique, preparer_lexique
+from src.rapport_generateur import Generateur_rapport
+from src.sentiments_analyse import SentimentAnalyzer, POSITIVE_WORDS, NEGATIVE_WORDS
+
+
+class TestLexique:
+    """Tests pour la compilation et le chargement du lexique."""
+
+    def test_compilation_et_chargement(self, tmp_path):
+        """L'artefact rechargé par mmap contient les mêmes termes que la source."""
+        artefact = tmp_path / "lexique.bin"
+        compiler_lexique("data/lexique.json", artefact)
+        lexique = charger_lexique(artefact)
+
+        assert lexique.version == "1.0.0"
+        assert lexique.termes("positifs") == POSITIVE_WORDS
+        assert lexique.termes("negatifs") == NEGATIVE_WORDS
+        assert all(poids == 1.0 for _, poids in lexique.items("positifs"))
+
+    def test_poids_personnalises(self, tmp_path):
+        """Les poids du fichier source sont conservés dans l'artefact."""
+        source = tmp_path / "lexique.json"
+        source.write_text('{"version": "test", "positifs": {"génial": 2.5, "bien": 0.3}, "negations": ["pas"]}', encoding="utf-8")
+        compiler_lexique(source, tmp_path / "lexique.bin")
+        lexique = charger_lexique(tmp_path / "lexique.bin")
+
+        assert lexique.items("positifs") == (("bien", 0.3), ("génial", 2.5))
+        assert lexique.termes("negations") == {"pas"}
+        assert lexique.items("negatifs") == ()
+
+    def test_automate_equivalent_aux_sous_chaines(self, tmp_path):
+        """L'automate de l'artefact trouve exactement les termes contenus dans le texte, chevauchements compris."""
+        source = tmp_path / "lexique.json"
+        source.write_text(
+            '{"version": "test", "positifs": {"super": 1.0, "superbe": 0.5, "très bien": 2.0}, '
+            '"negatifs": ["be", "retard"], "intensifieurs": ["très"]}',
+            encoding="utf-8"
+        )
+        compiler_lexique(source, tmp_path / "lexique.bin")
+        lexique = charger_lexique(tmp_path / "lexique.bin")
+
+        trouves = {lexique.terme(i) for i in lexique.rechercher("un produit superbe et très bien emballé")}
+        assert trouves == {"super", "superbe", "be", "très bien", "très"}
+
+        sommes, nombres = lexique.compter("un produit superbe et très bien emballé")
+        assert sommes[:2] == [3.5, 1.0]
+        assert nombres == [3, 1, 1, 0]
+
+    def test_preparer_compile_au_premier_usage(self, tmp_path):
+        """L'artefact est compilé s'il manque, puis recompilé quand la source change."""
+        source = tmp_path / "lexique.json"
+        artefact = tmp_path / "lexique.bin"
+        source.write_text('{"version": "1", "positifs": ["bien"]}', encoding="utf-8")
+
+        assert preparer_lexique(source, artefact).version == "1"
+        assert artefact.exists()
+
+        source.write_text('{"version": "2", "positifs": ["bien", "super"]}', encoding="utf-8")
+        os.utime(artefact, (0, 0))
+        lexique = preparer_lexique(source, artefact)
+        assert lexique.version == "2"
+        assert lexique.termes("positifs") == {"bien", "super"}
+
+    def test_artefact_invalide(self, tmp_path):
+        """Un fichier qui n'est pas un artefact est refusé."""
+        faux = tmp_path / "faux.bin"
+        faux.write_bytes(b"PASUNLEXIQUE")
+
+        with pytest.raises(ValueError, match="artefact de lexique"):
+            charger_lexique(faux)
+
+    def test_artefact_tronque(self, tmp_path):
+        """Un artefact tronqué est refusé au chargement au lieu de fausser toute l'analyse."""
+        artefact = tmp_path / "lexique.bin"
+        compiler_lexique("data/lexique.json", artefact)
+        contenu = artefact.read_bytes()
+
+        for taille in (40, len(contenu) // 2, len(contenu) - 8):
+            artefact.write_bytes(contenu[:taille])
+            with pytest.raises(ValueError, match="tronqué"):
+                charger_lexique(artefact)
+
+    def test_version_dans_resume(self, tmp_path):
+        """L'analyse avec un artefact donne les mêmes résultats et reporte la version du lexique."""
+        artefact = tmp_path / "lexique.bin"
+        compiler_lexique("data/lexique.json", artefact)
+        df = pd.DataFrame({"review_text": ["Excellent produit, je le recommande !", "Service horrible."]})
+
+        integre = SentimentAnalyzer().analyse_dataframe(df)
+        compile = SentimentAnalyzer(lexique_artefact=str(artefact)).analyse_dataframe(df)
+        assert integre["polarite"].tolist() == compile["polarite"].tolist()
+
+        generator = Generateur_rapport("output/test_results.csv", "output/test_summary.json")
+        assert generator.calculer_statistiques(compile)["version_lexique"] == "1.0.0"
+        assert generator.calculer_statistiques(integre)["version_lexique"] == "integre"
@@ -0,0 +1,77 @@
+import json
+import pandas as pd
+from src.rapport_generateur import Generateur_rapport
+from src.sentiments_analyse import LEXIQUE_INTEGRE
+from src.sketches import CountMinSketch, SpaceSaving, ProfilsTermes
+
+
+class TestSketches:
+    """Tests pour les structures de comptage en mémoire bornée."""
+
+    def test_count_min_ne_sous_estime_pas(self):
+        """Le Count-Min Sketch surestime au pire, jamais en dessous du vrai compte."""
+        sketch = CountMinSketch(largeur=16, profondeur=3)
+        for i in range(200):
+            sketch.ajouter(f"terme{i % 40}")
+
+        assert all(sketch.estimer(f"terme{i}") >= 5 for i in range(40))
+
+    def test_ajout_par_lot_equivalent(self):
+        """Ajouter un lot de termes (avec doublons et largeur quelconque) revient à les ajouter un par un."""
+        termes = [f"terme{i % 37}" for i in range(300)]
+        un_par_un, par_lot = CountMinSketch(largeur=100, profondeur=5), CountMinSketch(largeur=100, profondeur=5)
+        for terme in termes:
+            un_par_un.ajouter(terme)
+        par_lot.ajouter_lot(termes)
+
+        assert (un_par_un.table == par_lot.table).all()
+        assert par_lot.table.sum() == 5 * len(termes)
+
+    def test_space_saving_trouve_les_frequents(self):
+        """Les termes les plus fréquents restent dans un résumé de capacité réduite."""
+        resume = SpaceSaving(capacite=20)
+        for i in range(1000):
+            resume.ajouter("livraison" if i % 3 == 0 else f"rare{i}")
+            if i % 5 == 0:
+                resume.ajouter("retard")
+
+        assert [terme for terme, _ in resume.top(2)] == ["livraison", "retard"]
+        assert len(resume.compteurs) <= 20
+
+    def test_fusion_equivalente_au_flux_complet(self):
+        """Compter deux blocs séparément puis fusionner donne le même top-k qu'en un seul passage."""
+        textes = ["Colis en retard et abîmé", "Retard de livraison", "Excellent produit", "Produit excellent, livraison rapide"]
+        sentiments = ["Negatif", "Negatif", "Positif", "Positif"]
+
+        complet = ProfilsTermes(LEXIQUE_INTEGRE)
+        complet.ajouter_textes(textes, sentiments)
+
+        bloc1, bloc2 = ProfilsTermes(LEXIQUE_INTEGRE), ProfilsTermes(LEXIQUE_INTEGRE)
+        bloc1.ajouter_textes(textes[:2], sentiments[:2])
+        bloc2.ajouter_textes(textes[2:], sentiments[2:])
+        bloc1.fusionner(ProfilsTermes.depuis_dict(json.loads(json.dumps(bloc2.vers_dict()))))
+
+        assert bloc1.top(5) == complet.top(5)
+        assert complet.top(1)["Negatif"]["unigrammes"] == [{"terme": "retard", "nombre": 2}]
+        assert {"terme": "excellent", "nombre": 2} in complet.top(5)["Positif"]["lexique"]
+
+    def test_termes_dans_resume(self, tmp_path):
+        """Le résumé JSON contient les termes fréquents par sentiment et l'état des sketches est sauvegardé."""
+        generator = Generateur_rapport(
+            output_csv=str(tmp_path / "results.csv"),
+            output_summary=str(tmp_path / "summary.json"),
+            output_termes=str(tmp_path / "termes.json"),
+            top_k=3,
+            lexique=LEXIQUE_INTEGRE
+        )
+        df = pd.DataFrame({
+            "review_text": ["Service horrible, retard", "Retard encore", "Produit excellent"],
+            "sentiment_final": ["Negatif", "Negatif", "Positif"],
+            "polarite": [-0.5, -0.2, 0.6]
+        })
+        generator.generer_rapports(df)
+
+        summary = json.loads((tmp_path / "summary.json").read_text(encoding="utf-8"))
+        assert summary["termes_frequents"]["Negatif"]["unigrammes"][0] == {"terme": "retard", "nombre": 2}
+        assert set(summary["termes_frequents"]["Negatif"]) == {"unigrammes", "bigrammes", "lexique"}
+        assert generator.charger_termes(tmp_path / "termes.json").top(3) == generator.calculer_termes_frequents(df).top(3)